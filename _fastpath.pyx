@@ -0,0 +1,59 @@
+# cython: language_level=3
+"""
+Compiled versions of the file_organizer hot-path helpers.
+
+Build in place with ``cythonize -i _fastpath.pyx``. file_organizer imports this
+module when it is available and keeps its pure-Python helpers otherwise.
+"""
+from os import sep as _os_sep
+
+cdef str SEP = _os_sep
+cdef dict _ext_to_category = {}
+cdef str _other_category = 'Others'
+
+def configure(dict ext_to_category, str other_category):
+    """Install the extension -> category map used by get_file_category"""
+    global _ext_to_category, _other_category
+    _ext_to_category = ext_to_category
+    _other_category = other_category
+
+cpdef str get_file_category(str file_path):
+    """Determine the category for a file based on its extension."""
+    cdef Py_ssize_t name_start = file_path.rfind(SEP) + 1
+    cdef Py_ssize_t i = file_path.rfind('.', name_start)
+    # Like Path.suffix, a leading dot (e.g. '.gitignore') is not an extension
+    if i <= name_start:
+        return _other_category
+    return _ext_to_category.get(file_path[i:].lower(), _other_category)
+
+cpdef tuple process_dir_listing(str dir_content):
+    """
+    Process directory listing output into files and directories lists.
+
+    Entries are separated by '\n' only; every other character, including
+    '\r' and other line breaks, is kept as part of the name. This must match
+    file_organizer.process_dir_listing.
+    """
+    cdef list files = []
+    cdef list dirs = []
+    cdef Py_ssize_t n, start, end
+
+    if not dir_content:
+        return files, dirs
+
+    # One forward scan over the listing, classifying each line by its marker
+    n = len(dir_content)
+    start = 0
+    while start < n:
+        end = dir_content.find('\n', start)
+        if end < 0:
+            end = n
+
+        if dir_content.startswith('[FILE] ', start, end):
+            files.append(dir_content[start + 7:end])
+        elif dir_content.startswith('[DIR] ', start, end):
+            dirs.append(dir_content[start + 6:end])
+
+        start = end + 1
+
+    return files, dirs
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 from mcp.server.fastmcp import FastMCP, Context
 import os
-from pathlib import Path
+import re
 import logging
+from collections import defaultdict
+import bisect
 import functools
-from typing import Dict, List, Optional, Set, Tuple, Union, Callable, Any
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union, Callable, Any
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +33,16 @@ CATEGORIES = {
 }
 OTHER_CATEGORY = 'Others'
 
+# Category directories created by the organizer, in report order
+_CATEGORY_ORDER = (*CATEGORIES, OTHER_CATEGORY)
+_CATEGORY_NAMES = frozenset(_CATEGORY_ORDER)
+
+# Flat extension -> category lookup; built in reverse so the first category
+# listing an extension wins (e.g. '.html' stays a Document)
+EXT_TO_CATEGORY: Dict[str, str] = {
+    ext: cat for cat, exts in reversed(CATEGORIES.items()) for ext in exts
+}
+
 # Common project indicators
 PROJECT_INDICATORS = {
     'files': {
@@ -42,76 +57,325 @@ PROJECT_INDICATORS = {
     }
 }
 
+# Lowercased indicator names, matched against lowercased listings by set intersection
+PROJECT_FILES_LOWER = frozenset(name.lower() for name in PROJECT_INDICATORS['files'])
+PROJECT_DIRS_LOWER = frozenset(name.lower() for name in PROJECT_INDICATORS['directories'])
+
 # Common excluded directories for searches and recursive operations
 EXCLUDED_DIRS = ['.git', 'node_modules', '__pycache__', '.venv', 'venv', 'env']
 
+# Set views for membership tests; EXCLUDED_DIRS stays a list for the search_files payload
+_EXCLUDED = frozenset(EXCLUDED_DIRS)
+_SKIP_DIRS = _CATEGORY_NAMES | _EXCLUDED
+
+# Maximum number of MCP tool calls kept in flight by the batch helpers
+MAX_CONCURRENT_CALLS = 16
+
+# Set LOCAL_FS_FAST_PATH=1 when the filesystem MCP server runs on this machine to read
+# allowed directories with os.scandir/os.stat instead of a round-trip per listing or stat
+LOCAL_FS_FAST_PATH = os.environ.get('LOCAL_FS_FAST_PATH') == '1'
+
+# Seconds a fetched allowed-directories list is reused by verify_access
+ALLOWED_DIRS_TTL = 60.0
+
+# Patterns for get_file_info responses: any 'key: value' line, and the size line alone
+_INFO_LINE = re.compile(r'^(\w+):[ \t]*(.*)$', re.M)
+_SIZE_RE = re.compile(r'^size:[ \t]*(\d+)', re.M)
+
 # Helper function to get file category
 def get_file_category(file_path: str) -> str:
     """Determine the category for a file based on its extension."""
-    file_extension = Path(file_path).suffix.lower()
-    for category, extensions in CATEGORIES.items():
-        if file_extension in extensions:
-            return category
-    return OTHER_CATEGORY
+    file_name = file_path[file_path.rfind(os.sep) + 1:]
+    i = file_name.rfind('.')
+    # Like Path.suffix, a leading dot (e.g. '.gitignore') is not an extension
+    if i <= 0:
+        return OTHER_CATEGORY
+    return EXT_TO_CATEGORY.get(file_name[i:].lower(), OTHER_CATEGORY)
+
+# Helper function to build child paths without os.path.join
+def _dir_prefix(path: str) -> str:
+    """Return path with a trailing separator so children can be joined by concatenation"""
+    return path if path.endswith(os.sep) else path + os.sep
 
 # Helper function to process directory listing
 def process_dir_listing(dir_content: str) -> tuple[list[str], list[str]]:
-    """Process directory listing output into files and directories lists"""
+    """
+    Process directory listing output into files and directories lists.
+    
+    Entries are separated by '\n' only; every other character, including
+    '\r' and other line breaks, is kept as part of the name. The compiled
+    version in _fastpath.pyx follows the same rule.
+    """
+    files, dirs = [], []
     if not dir_content:
-        return [], []
-        
-    files = [line.replace('[FILE] ', '') for line in dir_content.split('\n') 
-             if line.strip() and line.startswith('[FILE]')]
+        return files, dirs
     
-    dirs = [line.replace('[DIR] ', '') for line in dir_content.split('\n') 
-            if line.strip() and line.startswith('[DIR]')]
+    # Single pass; fixed-length slices strip the '[FILE] ' / '[DIR] ' markers
+    for line in dir_content.split('\n'):
+        if line.startswith('[FILE] '):
+            files.append(line[7:])
+        elif line.startswith('[DIR] '):
+            dirs.append(line[6:])
     
     return files, dirs
 
+# Use the compiled helpers from _fastpath.pyx when they have been built
+try:
+    import _fastpath
+except ImportError:
+    _fastpath = None
+else:
+    _fastpath.configure(EXT_TO_CATEGORY, OTHER_CATEGORY)
+    get_file_category = _fastpath.get_file_category
+    process_dir_listing = _fastpath.process_dir_listing
+
+# Helper function to issue several MCP tool calls concurrently
+def batch_call_tool(ctx: Context, tool_name: str, arguments: List[Dict[str, Any]]) -> List[Union[str, Exception]]:
+    """
+    Call the same MCP tool once per argument dict, keeping several calls in flight.
+    
+    Args:
+        ctx: MCP context
+        tool_name: Name of the tool to call
+        arguments: One argument dict per call
+        
+    Returns:
+        Results in the same order as arguments; a failed call yields its exception
+    """
+    def _call(args: Dict[str, Any]) -> Union[str, Exception]:
+        try:
+            return ctx.call_tool(tool_name, args)
+        except Exception as e:
+            return e
+    
+    if len(arguments) <= 1:
+        return [_call(args) for args in arguments]
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_CALLS, len(arguments))) as executor:
+        return list(executor.map(_call, arguments))
+
+# Helper functions for the local filesystem fast path
+def _scan_local(path: str) -> str:
+    """List a directory with os.scandir, formatted like the server's list_directory output"""
+    with os.scandir(path) as entries:
+        return "\n".join(
+            f"[DIR] {entry.name}" if entry.is_dir(follow_symlinks=False) else f"[FILE] {entry.name}"
+            for entry in entries
+        )
+
+def _stat_local(path: str) -> int:
+    """Return the size of a path with os.stat, as the server's get_file_info reports it"""
+    return os.stat(path).st_size
+
+def _try_local(path: str, ctx: Context, read: Callable[[str], Any]) -> Any:
+    """
+    Run read(path) directly on disk when the local fast path applies.
+    
+    The server resolves symlinks before checking access, while os.scandir and
+    os.stat follow them, so any path whose real location differs from its
+    normalized form is left to the server.
+    
+    Args:
+        path: Path to read
+        ctx: MCP context, used to check the path against the allowed directories
+        read: Local implementation to run, e.g. _scan_local
+        
+    Returns:
+        The result of read, or None if the caller should go through the MCP server
+    """
+    if not LOCAL_FS_FAST_PATH:
+        return None
+    try:
+        real_path = os.path.realpath(path)
+        if real_path != os.path.normpath(os.path.abspath(path)) or not is_path_allowed(real_path, ctx):
+            return None
+        return read(real_path)
+    except Exception:
+        return None  # Fall back to the server, which reports errors in its own format
+
+# Helper function to get a raw directory listing
+def fetch_dir_listing(path: str, ctx: Context) -> str:
+    """Get the '[FILE]'/'[DIR]' listing of a directory, from disk when the fast path applies"""
+    listing = _try_local(path, ctx, _scan_local)
+    if listing is not None:
+        return listing
+    return ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
+
+# Helper function to list several directories in one round-trip
+def batch_list_directories(paths: List[str], ctx: Context) -> List[Union[str, Exception]]:
+    """List the given directories concurrently, returning raw listings in input order"""
+    results: List[Union[str, Exception, None]] = [_try_local(p, ctx, _scan_local) for p in paths]
+    remote = [i for i, result in enumerate(results) if result is None]
+    listings = batch_call_tool(ctx, "mcp_filesystem_list_directory", [{"path": paths[i]} for i in remote])
+    for i, listing in zip(remote, listings):
+        results[i] = listing
+    return results
+
+# Helper function to get the sizes of several paths in one round-trip
+def batch_get_sizes(paths: List[str], ctx: Context) -> Dict[str, int]:
+    """
+    Retrieve file sizes for the given paths concurrently.
+    
+    Args:
+        paths: Files or directories to stat
+        ctx: MCP context
+        
+    Returns:
+        Mapping of path to size in bytes; paths whose info could not be read are omitted
+    """
+    sizes = {}
+    remote = []
+    for file_path in paths:
+        size = _try_local(file_path, ctx, _stat_local)
+        if size is None:
+            remote.append(file_path)
+        else:
+            sizes[file_path] = size
+    
+    infos = batch_call_tool(ctx, "mcp_filesystem_get_file_info", [{"path": p} for p in remote])
+    for file_path, file_info in zip(remote, infos):
+        if isinstance(file_info, Exception):
+            logger.error(f"Error getting info for {file_path}: {file_info}")
+            continue
+        match = _SIZE_RE.search(file_info)
+        if match:
+            sizes[file_path] = int(match.group(1))
+    return sizes
+
+# Helper function to get a parsed directory listing
+def get_dir_listing(dir_path: str, ctx: Context,
+                    cache: Optional[Dict[str, Tuple[List[str], List[str]]]] = None) -> Tuple[List[str], List[str]]:
+    """
+    List a directory and split it into files and directories.
+    
+    Args:
+        dir_path: Directory to list
+        ctx: MCP context
+        cache: Optional per-invocation cache of parsed listings keyed by path
+        
+    Returns:
+        Tuple of (files, dirs)
+    """
+    if cache is not None and dir_path in cache:
+        return cache[dir_path]
+    
+    listing = process_dir_listing(fetch_dir_listing(dir_path, ctx))
+    if cache is not None:
+        cache[dir_path] = listing
+    return listing
+
+# Helper function to warm a listing cache in one batch
+def prefetch_dir_listings(paths: List[str], ctx: Context,
+                          cache: Dict[str, Tuple[List[str], List[str]]]) -> None:
+    """Fetch the listings of all uncached paths concurrently and store them in cache"""
+    missing = [p for p in paths if p not in cache]
+    for dir_path, dir_content in zip(missing, batch_list_directories(missing, ctx)):
+        # Failed listings stay uncached so get_dir_listing retries and reports them
+        if not isinstance(dir_content, Exception):
+            cache[dir_path] = process_dir_listing(dir_content)
+
+# Helper function to pick the largest entries without sorting everything
+def _top_n_by_size(sizes: Dict[str, int], n: int = 5) -> List[Tuple[str, int]]:
+    """Return the n (name, size) pairs with the largest sizes, largest first"""
+    return heapq.nlargest(n, sizes.items(), key=lambda item: item[1])
+
+# Size units for format_size, largest first
+_SIZE_UNITS = ((1 << 40, 'TB'), (1 << 30, 'GB'), (1 << 20, 'MB'), (1 << 10, 'KB'))
+
 # Helper function to format file sizes
 def format_size(size_bytes: int) -> str:
     """Convert size in bytes to appropriate unit with formatting"""
-    if size_bytes < 1024:
-        return f"{size_bytes} bytes"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    else:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
+    for threshold, unit in _SIZE_UNITS:
+        if size_bytes >= threshold:
+            return f"{size_bytes / threshold:.2f} {unit}"
+    return f"{size_bytes} bytes"
+
+# Helper function to check a parsed listing for project indicators
+def _has_project_indicator(files: List[str], dirs: List[str]) -> bool:
+    """Return True if an already-parsed listing contains a project indicator file or directory"""
+    if not PROJECT_FILES_LOWER.isdisjoint({f.lower() for f in files}):
+        return True
+    return not PROJECT_DIRS_LOWER.isdisjoint({d.lower() for d in dirs})
 
 # Helper function to detect if a directory is a project directory
-def is_project_directory(dir_path: str, ctx: Context) -> bool:
+def is_project_directory(dir_path: str, ctx: Context,
+                         cache: Optional[Dict[str, Tuple[List[str], List[str]]]] = None) -> bool:
     """
     Determine if a directory appears to be a project directory.
     
     Args:
         dir_path: Path to check
         ctx: MCP context
+        cache: Optional listing cache shared with the caller (see get_dir_listing)
         
     Returns:
         True if directory appears to be a project, False otherwise
     """
     try:
         # Get directory content
-        dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": dir_path})
-        files, dirs = process_dir_listing(dir_content)
+        files, dirs = get_dir_listing(dir_path, ctx, cache)
         
-        # Check for project indicator files
-        for file_name in files:
-            if file_name.lower() in PROJECT_INDICATORS['files']:
-                logger.info(f"Project indicator file found: {file_name} in {dir_path}")
-                return True
-                
-        # Check for project indicator directories
-        for dir_name in dirs:
-            if dir_name.lower() in PROJECT_INDICATORS['directories']:
-                logger.info(f"Project indicator directory found: {dir_name} in {dir_path}")
-                return True
+        if _has_project_indicator(files, dirs):
+            logger.info(f"Project indicators found in {dir_path}")
+            return True
         
         return False
     except Exception as e:
         logger.error(f"Error checking if {dir_path} is a project directory: {e}")
         return False  # If in doubt, consider it's not a project directory
 
+# Cached allowed-directory prefixes as (fetch time, prefixes)
+_allowed_dirs_cache: Optional[Tuple[float, Tuple[str, ...]]] = None
+
+# Helper function to normalize a path for prefix comparisons
+def _as_prefix(path: str) -> str:
+    """Normalize a path and give it a trailing separator so '/a' does not match '/ab'"""
+    return os.path.normpath(path).rstrip(os.sep) + os.sep
+
+# Helper function to get the allowed directories
+def get_allowed_prefixes(ctx: Context) -> Tuple[str, ...]:
+    """
+    Return the directories the MCP server may access, normalized by _as_prefix.
+    
+    The list is fetched once and reused for ALLOWED_DIRS_TTL seconds, so
+    consecutive tool calls do not each pay for an extra round-trip. Prefixes
+    are sorted and directories nested inside another allowed directory are
+    dropped, which lets is_path_allowed find the only candidate with bisect.
+    
+    Args:
+        ctx: MCP context used when the cache is empty or stale
+        
+    Returns:
+        Sorted tuple of normalized directory prefixes, none a prefix of another
+    """
+    global _allowed_dirs_cache
+    now = time.monotonic()
+    if _allowed_dirs_cache is not None and now - _allowed_dirs_cache[0] < ALLOWED_DIRS_TTL:
+        return _allowed_dirs_cache[1]
+    
+    allowed_dirs = ctx.call_tool("mcp_filesystem_list_allowed_directories", {})
+    prefixes = []
+    for prefix in sorted({_as_prefix(d.strip()) for d in allowed_dirs.splitlines() if d.strip()}):
+        # Sorting puts a directory right after its closest allowed ancestor
+        if not prefixes or not prefix.startswith(prefixes[-1]):
+            prefixes.append(prefix)
+    _allowed_dirs_cache = (now, tuple(prefixes))
+    return _allowed_dirs_cache[1]
+
+def invalidate_allowed_dirs_cache() -> None:
+    """Forget the cached allowed directories, e.g. after the server was reconfigured"""
+    global _allowed_dirs_cache
+    _allowed_dirs_cache = None
+
+# Helper function to check a path against the allowed directories
+def is_path_allowed(path: str, ctx: Context) -> bool:
+    """Return True if path lies inside one of the directories the MCP server may access"""
+    path_prefix = _as_prefix(path)
+    prefixes = get_allowed_prefixes(ctx)
+    # In a sorted, prefix-free list only the greatest entry <= path can contain it
+    i = bisect.bisect_right(prefixes, path_prefix) - 1
+    return i >= 0 and path_prefix.startswith(prefixes[i])
+
 # Decorator to verify directory access
 def verify_access(func: Callable) -> Callable:
     """Decorator to verify if a directory/file is accessible by the MCP server"""
@@ -121,15 +385,7 @@ def verify_access(func: Callable) -> Callable:
         ctx = kwargs.get('ctx')
         
         try:
-            allowed_dirs = ctx.call_tool("mcp_filesystem_list_allowed_directories", {})
-            
-            is_allowed = False
-            for allowed_dir in allowed_dirs.split('\n'):
-                if allowed_dir.strip() and path.startswith(allowed_dir.strip()):
-                    is_allowed = True
-                    break
-                    
-            if not is_allowed:
+            if not is_path_allowed(path, ctx):
                 return f"Warning: {path} is NOT in the allowed directories list"
                 
             return func(path, *args, **kwargs)
@@ -142,14 +398,15 @@ def verify_access(func: Callable) -> Callable:
 @mcp.tool()
 def list_categories() -> str:
     """List all file categories supported by the organizer"""
-    categories = list(CATEGORIES.keys()) + [OTHER_CATEGORY]
-    return "Available file categories:\n" + "\n".join(f"- {category}" for category in categories)
+    return "Available file categories:\n" + "\n".join(f"- {category}" for category in _CATEGORY_ORDER)
 
 @mcp.tool()
 def list_allowed_directories(ctx: Context) -> str:
     """List all directories the MCP server is allowed to access"""
     try:
         result = ctx.call_tool("mcp_filesystem_list_allowed_directories", {})
+        # The server answered directly; let verify_access pick up any changes
+        invalidate_allowed_dirs_cache()
         logger.info("Listed allowed directories")
         return f"Allowed directories:\n{result}"
     except Exception as e:
@@ -169,10 +426,9 @@ def create_category_directories(path: str, ctx: Context) -> str:
         Summary of created directories
     """
     # Create all category directories
-    categories = list(CATEGORIES.keys()) + [OTHER_CATEGORY]
     created_dirs = []
     
-    for category in categories:
+    for category in _CATEGORY_ORDER:
         category_dir = os.path.join(path, category)
         try:
             ctx.call_tool("mcp_filesystem_create_directory", {"path": category_dir})
@@ -194,9 +450,37 @@ def list_directory_files(path: str, ctx: Context) -> str:
     Returns:
         Formatted list of files and directories
     """
-    result = ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
+    result = fetch_dir_listing(path, ctx)
     return f"Contents of {path}:\n{result}"
 
+# Helper function to generate the analyze_directory report
+def _analysis_summary_lines(path: str, categorized: Dict[str, List[str]], recursive: bool,
+                            max_depth: int, directories_processed: int) -> Iterator[str]:
+    """Yield the lines of a directory analysis summary one at a time"""
+    yield f"{'Recursive ' if recursive else ''}Directory Analysis Summary:"
+    if recursive:
+        yield f"Base directory: {path}"
+        yield f"Total subdirectories processed: {directories_processed}"
+        if max_depth < 999:
+            yield f"Maximum depth: {max_depth} levels"
+    
+    total_files = sum(len(files) for files in categorized.values())
+    yield f"Total Files: {total_files}"
+    yield ""
+    
+    # Report files by category
+    max_examples = 10 if recursive else 5
+    for category in _CATEGORY_ORDER:
+        files = categorized.get(category)
+        if files:
+            yield f"{category}: {len(files)} files"
+            # Show the alphabetically first files without sorting the whole list
+            for file in heapq.nsmallest(max_examples, files):
+                yield f"  - {file}"
+            if len(files) > max_examples:
+                yield f"  - ... and {len(files) - max_examples} more"
+            yield ""
+
 @mcp.tool()
 @verify_access
 def analyze_directory(path: str, recursive: bool = False, max_depth: int = 2, ctx: Context = None) -> str:
@@ -211,90 +495,68 @@ def analyze_directory(path: str, recursive: bool = False, max_depth: int = 2, ct
     Returns:
         Analysis summary with file categories
     """
-    def _analyze_dir_recursive(current_path: str, relative_path: str = "", current_depth: int = 1):
-        """Helper function to analyze directory recursively with depth control"""
-        nonlocal directories_processed
-        
-        # Get directory listing
-        dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": current_path})
-        files, dirs = process_dir_listing(dir_content)
-        
-        # Count this directory
-        directories_processed += 1
-        
-        # Process files in the current directory
-        for file_name in files:
-            # Skip files that are already category directories
-            if file_name in CATEGORIES or file_name == OTHER_CATEGORY:
-                continue
-                
-            category = get_file_category(file_name)
-            file_path = os.path.join(relative_path, file_name) if relative_path else file_name
-            categorized[category].append(file_path)
-        
-        # Only recurse if we haven't reached max depth
-        if current_depth < max_depth:
-            for dir_name in dirs:
-                # Skip category directories and system directories
-                if dir_name in CATEGORIES or dir_name == OTHER_CATEGORY or dir_name in EXCLUDED_DIRS:
-                    continue
-                    
-                subdir_path = os.path.join(current_path, dir_name)
-                subdir_rel_path = os.path.join(relative_path, dir_name) if relative_path else dir_name
-                
-                try:
-                    _analyze_dir_recursive(subdir_path, subdir_rel_path, current_depth + 1)
-                except Exception as e:
-                    logger.error(f"Error processing subdirectory {subdir_path}: {e}")
-    
     # Track files by category
-    categorized = {cat: [] for cat in CATEGORIES.keys()}
-    categorized[OTHER_CATEGORY] = []
+    categorized: Dict[str, List[str]] = defaultdict(list)
     directories_processed = 0
     
     if recursive:
-        _analyze_dir_recursive(path)
+        # Walk the tree breadth-first so each level is listed in a single batch
+        frontier = [(path, "")]
+        current_depth = 1
+        while frontier:
+            listings = batch_list_directories([current_path for current_path, _ in frontier], ctx)
+            next_frontier = []
+            
+            for (current_path, relative_path), dir_content in zip(frontier, listings):
+                if isinstance(dir_content, Exception):
+                    if current_depth == 1:
+                        raise dir_content
+                    logger.error(f"Error processing subdirectory {current_path}: {dir_content}")
+                    continue
+                
+                files, dirs = process_dir_listing(dir_content)
+                path_prefix = _dir_prefix(current_path)
+                rel_prefix = relative_path + os.sep if relative_path else ""
+                
+                # Count this directory
+                directories_processed += 1
+                
+                # Process files in the current directory
+                for file_name in files:
+                    # Skip files that are already category directories
+                    if file_name in _CATEGORY_NAMES:
+                        continue
+                        
+                    category = get_file_category(file_name)
+                    categorized[category].append(rel_prefix + file_name)
+                
+                # Only queue subdirectories if we haven't reached max depth
+                if current_depth < max_depth:
+                    for dir_name in dirs:
+                        # Skip category directories and system directories
+                        if dir_name in _SKIP_DIRS:
+                            continue
+                            
+                        next_frontier.append((path_prefix + dir_name, rel_prefix + dir_name))
+            
+            frontier = next_frontier
+            current_depth += 1
     else:
         # Non-recursive analysis
-        dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
-        files, _ = process_dir_listing(dir_content)
+        files, _ = get_dir_listing(path, ctx)
         directories_processed = 1
         
         # Process files in the current directory only
         for file_name in files:
             # Skip files that are already category directories
-            if file_name in CATEGORIES or file_name == OTHER_CATEGORY:
+            if file_name in _CATEGORY_NAMES:
                 continue
                 
             category = get_file_category(file_name)
             categorized[category].append(file_name)
     
     # Generate summary
-    summary = [f"{'Recursive ' if recursive else ''}Directory Analysis Summary:"]
-    if recursive:
-        summary.append(f"Base directory: {path}")
-        summary.append(f"Total subdirectories processed: {directories_processed}")
-        if max_depth < 999:
-            summary.append(f"Maximum depth: {max_depth} levels")
-    
-    total_files = sum(len(files) for files in categorized.values())
-    summary.append(f"Total Files: {total_files}")
-    summary.append("")
-    
-    # Report files by category
-    for category, files in categorized.items():
-        if files:
-            summary.append(f"{category}: {len(files)} files")
-            # Sort files for better readability
-            sorted_files = sorted(files)
-            max_examples = 10 if recursive else 5
-            for file in sorted_files[:max_examples]:
-                summary.append(f"  - {file}")
-            if len(files) > max_examples:
-                summary.append(f"  - ... and {len(files) - max_examples} more")
-            summary.append("")
-                
-    return "\n".join(summary)
+    return "\n".join(_analysis_summary_lines(path, categorized, recursive, max_depth, directories_processed))
 
 @mcp.tool()
 @verify_access
@@ -379,25 +641,23 @@ def get_metadata(path: str, include_stats: bool = True, ctx: Context = None) ->
         metadata.append(f"Category: {file_category}")
     
     # Add the basic metadata from get_file_info
-    for line in basic_info.split('\n'):
-        if line and not line.startswith("isDirectory") and not line.startswith("isFile"):
-            # Clean up and format the metadata line
-            key, value = line.split(': ', 1) if ': ' in line else (line, "")
-            
-            # Convert size to readable format if this is the size field
-            if key.lower() == 'size':
-                try:
-                    size_bytes = int(value.strip())
-                    value = format_size(size_bytes)
-                except ValueError:
-                    pass  # Keep original value if conversion fails
-                    
-            metadata.append(f"{key.capitalize()}: {value}")
+    for match in _INFO_LINE.finditer(basic_info):
+        key, value = match.groups()
+        if key in ('isDirectory', 'isFile'):
+            continue
+        
+        # Convert size to readable format if this is the size field
+        if key.lower() == 'size':
+            try:
+                value = format_size(int(value))
+            except ValueError:
+                pass  # Keep original value if conversion fails
+                
+        metadata.append(f"{key.capitalize()}: {value}")
     
     # For directories, add content summary
     if is_directory:
-        dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
-        files, dirs = process_dir_listing(dir_content)
+        files, dirs = get_dir_listing(path, ctx)
         
         metadata.append(f"Total files: {len(files)}")
         metadata.append(f"Total subdirectories: {len(dirs)}")
@@ -405,80 +665,57 @@ def get_metadata(path: str, include_stats: bool = True, ctx: Context = None) ->
         # If stats are requested for a directory
         if include_stats and files:
             # Group files by category
-            file_by_category = {cat: [] for cat in CATEGORIES.keys()}
-            file_by_category[OTHER_CATEGORY] = []
+            file_by_category: Dict[str, List[str]] = defaultdict(list)
             
             # Batch file info retrieval for efficiency
-            file_paths = [os.path.join(path, file_name) for file_name in files]
-            
-            # Use read_multiple_files instead of individual calls when possible
-            file_sizes = {}
+            path_prefix = _dir_prefix(path)
+            file_paths = [path_prefix + file_name for file_name in files]
+            sizes_by_path = batch_get_sizes(file_paths, ctx)
+            file_sizes = {file_name: sizes_by_path[file_path]
+                          for file_name, file_path in zip(files, file_paths)
+                          if file_path in sizes_by_path}
             
-            # Process each file
-            for i, file_name in enumerate(files):
-                # Get file category
+            # Sort each file into its category
+            for file_name in files:
                 category = get_file_category(file_name)
                 file_by_category[category].append(file_name)
-                
-                # Get file size
-                file_path = os.path.join(path, file_name)
-                try:
-                    file_info = ctx.call_tool("mcp_filesystem_get_file_info", {"path": file_path})
-                    
-                    # Extract size
-                    for line in file_info.split('\n'):
-                        if line.startswith('size:'):
-                            size_str = line.replace('size:', '').strip()
-                            file_sizes[file_name] = int(size_str)
-                            break
-                except Exception as e:
-                    logger.error(f"Error getting info for {file_path}: {e}")
             
             # Add file type statistics
             metadata.append("\nFile Categories:")
-            for category, category_files in file_by_category.items():
+            for category in _CATEGORY_ORDER:
+                category_files = file_by_category.get(category)
                 if category_files:
                     metadata.append(f"{category}: {len(category_files)} files")
                     # Show examples
-                    for file in sorted(category_files)[:3]:
-                        size_info = f" ({format_size(file_sizes.get(file, 0))})" if file in file_sizes else ""
-                        metadata.append(f"  - {file}{size_info}")
+                    metadata.extend(
+                        f"  - {file} ({format_size(file_sizes[file])})" if file in file_sizes else f"  - {file}"
+                        for file in sorted(category_files)[:3]
+                    )
                     if len(category_files) > 3:
                         metadata.append(f"  - ... and {len(category_files) - 3} more")
             
             # Add size information
             if file_sizes:
                 total_size = sum(file_sizes.values())
-                largest_files = sorted(file_sizes.items(), key=lambda x: x[1], reverse=True)[:5]
+                largest_files = _top_n_by_size(file_sizes)
                 
                 metadata.append(f"\nTotal size: {format_size(total_size)}")
                 metadata.append("Largest files:")
-                for file_name, size in largest_files:
-                    metadata.append(f"  - {file_name}: {format_size(size)}")
+                metadata.extend(f"  - {file_name}: {format_size(size)}" for file_name, size in largest_files)
         
         # List subdirectories with their sizes
         if dirs:
             metadata.append("\nSubdirectories:")
-            subdir_sizes = {}
             
-            # Get size for each subdirectory (could batch this in future versions)
-            for subdir in dirs:
-                subdir_path = os.path.join(path, subdir)
-                try:
-                    subdir_info = ctx.call_tool("mcp_filesystem_get_file_info", {"path": subdir_path})
-                    for line in subdir_info.split('\n'):
-                        if line.startswith('size:'):
-                            size_str = line.replace('size:', '').strip()
-                            subdir_sizes[subdir] = int(size_str)
-                            break
-                except Exception as e:
-                    logger.error(f"Error getting size for {subdir_path}: {e}")
-                    subdir_sizes[subdir] = 0
+            # Get size for all subdirectories in one batch
+            path_prefix = _dir_prefix(path)
+            subdir_paths = [path_prefix + subdir for subdir in dirs]
+            sizes_by_path = batch_get_sizes(subdir_paths, ctx)
+            subdir_sizes = {subdir: sizes_by_path.get(subdir_path, 0)
+                            for subdir, subdir_path in zip(dirs, subdir_paths)}
             
             # Display subdirectories sorted alphabetically with their sizes
-            for subdir in sorted(dirs):
-                size_info = f" ({format_size(subdir_sizes.get(subdir, 0))})"
-                metadata.append(f"  - {subdir}{size_info}")
+            metadata.extend(f"  - {subdir} ({format_size(subdir_sizes.get(subdir, 0))})" for subdir in sorted(dirs))
     
     return "\n".join(metadata)
 
@@ -510,35 +747,34 @@ def analyze_project_directories(path: str, ctx: Context = None) -> str:
         List of identified project directories and indicators found
     """
     # Get directory listing
-    dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
-    _, dirs = process_dir_listing(dir_content)
+    _, dirs = get_dir_listing(path, ctx)
     
     # Track project directories and their indicators
     project_dirs = {}
     
+    # Skip category directories and system directories, then list the rest in one batch
+    candidate_dirs = [d for d in dirs if d not in _SKIP_DIRS]
+    listing_cache: Dict[str, Tuple[List[str], List[str]]] = {}
+    prefetch_dir_listings([os.path.join(path, d) for d in candidate_dirs], ctx, listing_cache)
+    
     # Process subdirectories
-    for dir_name in dirs:
-        # Skip category directories
-        if dir_name in CATEGORIES or dir_name == OTHER_CATEGORY:
-            continue
-        
+    for dir_name in candidate_dirs:
         dir_path = os.path.join(path, dir_name)
         
         # Check for project indicators
         indicators_found = []
         try:
-            subdir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": dir_path})
-            sub_files, sub_dirs = process_dir_listing(subdir_content)
+            sub_files, sub_dirs = get_dir_listing(dir_path, ctx, cache=listing_cache)
             
             # Check files
-            for file_name in sub_files:
-                if file_name.lower() in PROJECT_INDICATORS['files']:
-                    indicators_found.append(f"File: {file_name}")
+            files_lc = {f.lower(): f for f in sub_files}
+            indicators_found.extend(f"File: {files_lc[name]}"
+                                    for name in sorted(PROJECT_FILES_LOWER & files_lc.keys()))
             
             # Check directories
-            for subdir_name in sub_dirs:
-                if subdir_name.lower() in PROJECT_INDICATORS['directories']:
-                    indicators_found.append(f"Directory: {subdir_name}")
+            dirs_lc = {d.lower(): d for d in sub_dirs}
+            indicators_found.extend(f"Directory: {dirs_lc[name]}"
+                                    for name in sorted(PROJECT_DIRS_LOWER & dirs_lc.keys()))
             
             if indicators_found:
                 project_dirs[dir_name] = indicators_found
@@ -553,11 +789,42 @@ def analyze_project_directories(path: str, ctx: Context = None) -> str:
     for dir_name, indicators in project_dirs.items():
         summary.append(f"\n{dir_name}:")
         summary.append("  Project indicators found:")
-        for indicator in indicators:
-            summary.append(f"    - {indicator}")
+        summary.extend(f"    - {indicator}" for indicator in indicators)
     
     return "\n".join(summary)
 
+# Helper function to generate the bulk_move_files report
+def _bulk_summary_lines(organized: Dict[str, List[str]], moved_count: int, errors: List[str],
+                        project_dirs: List[str], category: Optional[str],
+                        respect_projects: bool) -> Iterator[str]:
+    """Yield the lines of a bulk organization summary one at a time"""
+    yield "Bulk Organization Summary:"
+    yield f"Total files moved: {moved_count}"
+    
+    # Report organized files by category
+    for cat in _CATEGORY_ORDER:
+        files = organized.get(cat)
+        if files:
+            yield f"\n{category or cat}: {len(files)} files"
+            for file in files[:5]:  # Show up to 5 examples
+                yield f"  - {file}"
+            if len(files) > 5:
+                yield f"  - ... and {len(files) - 5} more"
+    
+    # Report errors
+    if errors:
+        yield f"\nErrors ({len(errors)}):"
+        for error in errors[:5]:
+            yield f"  - {error}"
+        if len(errors) > 5:
+            yield f"  - ... and {len(errors) - 5} more errors"
+    
+    # Report project directories found
+    if respect_projects and project_dirs:
+        yield "\nIdentified project directories (contents preserved):"
+        for dir_name in project_dirs:
+            yield f"  - {dir_name}"
+
 @mcp.tool()
 @verify_access
 def bulk_move_files(path: str, category: str = None, file_extension: str = None, 
@@ -578,37 +845,27 @@ def bulk_move_files(path: str, category: str = None, file_extension: str = None,
     create_category_directories(path, ctx=ctx)
     
     # Get directory listing
-    dir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": path})
-    files, dirs = process_dir_listing(dir_content)
+    files, dirs = get_dir_listing(path, ctx)
+    
+    path_prefix = _dir_prefix(path)
+    
+    # Lowercase the extension filter once rather than for every file
+    ext_lc = file_extension.lower() if file_extension else None
     
     # Track files to be moved
-    files_by_category = {cat: [] for cat in CATEGORIES.keys()}
-    files_by_category[OTHER_CATEGORY] = []
+    files_by_category: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
     project_dirs = []
     skipped = []
     
-    # First identify project directories if needed
-    if respect_projects:
-        for dir_name in dirs:
-            # Skip category directories
-            if dir_name in CATEGORIES or dir_name == OTHER_CATEGORY:
-                continue
-            
-            dir_path = os.path.join(path, dir_name)
-            
-            # Check if it's a project directory
-            if is_project_directory(dir_path, ctx):
-                project_dirs.append(dir_name)
-    
     # Process files in root directory
     for file_name in files:
         # Skip files that are category directories
-        if file_name in CATEGORIES or file_name == OTHER_CATEGORY:
+        if file_name in _CATEGORY_NAMES:
             skipped.append(file_name)
             continue
             
         # Filter by extension if specified
-        if file_extension and not file_name.lower().endswith(file_extension.lower()):
+        if ext_lc and not file_name.lower().endswith(ext_lc):
             continue
             
         detected_category = get_file_category(file_name)
@@ -618,98 +875,92 @@ def bulk_move_files(path: str, category: str = None, file_extension: str = None,
             continue
             
         # Add to the appropriate category list
-        file_path = os.path.join(path, file_name)
-        files_by_category[detected_category].append((file_path, file_name))
+        files_by_category[detected_category].append((path_prefix + file_name, file_name))
     
-    # For non-project subdirectories, collect their files too
+    # List each subdirectory once: detect projects and collect files from the rest
     if respect_projects:
-        non_project_dirs = [d for d in dirs if d not in CATEGORIES and 
-                           d != OTHER_CATEGORY and 
-                           d not in project_dirs and
-                           d not in EXCLUDED_DIRS]
+        # Skip category directories and system directories
+        candidate_dirs = [d for d in dirs if d not in _SKIP_DIRS]
+        listing_cache: Dict[str, Tuple[List[str], List[str]]] = {}
+        prefetch_dir_listings([path_prefix + d for d in candidate_dirs], ctx, listing_cache)
         
-        for dir_name in non_project_dirs:
-            dir_path = os.path.join(path, dir_name)
+        for dir_name in candidate_dirs:
+            dir_path = path_prefix + dir_name
+            dir_prefix = dir_path + os.sep
             
-            # Process non-project directory files
             try:
-                subdir_content = ctx.call_tool("mcp_filesystem_list_directory", {"path": dir_path})
-                subdir_files, _ = process_dir_listing(subdir_content)
-                
-                for file_name in subdir_files:
-                    # Filter by extension if specified
-                    if file_extension and not file_name.lower().endswith(file_extension.lower()):
-                        continue
-                        
-                    detected_category = get_file_category(file_name)
-                    
-                    # Filter by category if specified
-                    if category and category != detected_category:
-                        continue
-                        
-                    # Add to the appropriate category list
-                    file_path = os.path.join(dir_path, file_name)
-                    display_name = f"{dir_name}/{file_name}"
-                    files_by_category[detected_category].append((file_path, display_name))
+                subdir_files, _ = get_dir_listing(dir_path, ctx, cache=listing_cache)
             except Exception as e:
                 logger.error(f"Error processing subdirectory {dir_path}: {e}")
+                continue
+            
+            # Leave project directories untouched; the check reads the cached listing
+            if is_project_directory(dir_path, ctx, cache=listing_cache):
+                project_dirs.append(dir_name)
+                continue
+            
+            # Process non-project directory files
+            for file_name in subdir_files:
+                # Filter by extension if specified
+                if ext_lc and not file_name.lower().endswith(ext_lc):
+                    continue
+                    
+                detected_category = get_file_category(file_name)
+                
+                # Filter by category if specified
+                if category and category != detected_category:
+                    continue
+                    
+                # Add to the appropriate category list
+                display_name = f"{dir_name}/{file_name}"
+                files_by_category[detected_category].append((dir_prefix + file_name, display_name))
     
     # Now move the files in bulk by category
     moved_count = 0
     errors = []
-    organized = {cat: [] for cat in CATEGORIES.keys()}
-    organized[OTHER_CATEGORY] = []
+    organized: Dict[str, List[str]] = defaultdict(list)
     
-    # Process each category
-    for cat, file_list in files_by_category.items():
+    # Flatten the per-category lists into one list of (category, source, destination, display name)
+    moves = []
+    for cat in _CATEGORY_ORDER:
+        file_list = files_by_category.get(cat)
         if not file_list:
             continue
             
         # Create summary of what's being moved
         logger.info(f"Moving {len(file_list)} files to {cat} category")
         
-        # Move each file in this category
+        category_prefix = path_prefix + cat + os.sep
         for file_path, display_name in file_list:
-            destination = os.path.join(path, cat, os.path.basename(file_path))
-            try:
-                ctx.call_tool("mcp_filesystem_move_file", {
-                    "source": file_path,
-                    "destination": destination
-                })
-                organized[cat].append(display_name)
-                moved_count += 1
-            except Exception as e:
-                errors.append(f"{os.path.basename(file_path)}: {str(e)}")
-                logger.error(f"Error moving {file_path}: {e}")
+            moves.append((cat, file_path, category_prefix + os.path.basename(file_path), display_name))
+    
+    # Move files concurrently; moves sharing a destination go in separate waves so
+    # the server still rejects the later ones instead of racing on the same target
+    outcomes: List[Union[str, Exception, None]] = [None] * len(moves)
+    pending = list(range(len(moves)))
+    while pending:
+        wave, deferred, destinations = [], [], set()
+        for i in pending:
+            (deferred if moves[i][2] in destinations else wave).append(i)
+            destinations.add(moves[i][2])
+        
+        results = batch_call_tool(ctx, "mcp_filesystem_move_file", [
+            {"source": moves[i][1], "destination": moves[i][2]} for i in wave
+        ])
+        for i, result in zip(wave, results):
+            outcomes[i] = result
+        pending = deferred
+    
+    for (cat, file_path, _, display_name), outcome in zip(moves, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(f"{os.path.basename(file_path)}: {str(outcome)}")
+            logger.error(f"Error moving {file_path}: {outcome}")
+        else:
+            organized[cat].append(display_name)
+            moved_count += 1
     
     # Generate summary
-    summary = ["Bulk Organization Summary:"]
-    summary.append(f"Total files moved: {moved_count}")
-    
-    # Report organized files by category
-    for cat, files in organized.items():
-        if files:
-            summary.append(f"\n{category or cat}: {len(files)} files")
-            for file in files[:5]:  # Show up to 5 examples
-                summary.append(f"  - {file}")
-            if len(files) > 5:
-                summary.append(f"  - ... and {len(files) - 5} more")
-    
-    # Report errors
-    if errors:
-        summary.append(f"\nErrors ({len(errors)}):")
-        for i, error in enumerate(errors[:5]):
-            summary.append(f"  - {error}")
-        if len(errors) > 5:
-            summary.append(f"  - ... and {len(errors) - 5} more errors")
-    
-    # Report project directories found
-    if respect_projects and project_dirs:
-        summary.append(f"\nIdentified project directories (contents preserved):")
-        for dir_name in project_dirs:
-            summary.append(f"  - {dir_name}")
-    
-    return "\n".join(summary)
+    return "\n".join(_bulk_summary_lines(organized, moved_count, errors, project_dirs, category, respect_projects))
 
 if __name__ == "__main__":
     # Run the MCP server